@@ -1,15 +1,44 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import orjson
 import os
+import copy
 import json
 import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from config import Config
 from src.pdf_downloader import PDFDownloader
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider serializing with orjson, used by jsonify and request.get_json"""
+    
+    def _option(self) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=self._option()).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._option()),
+            mimetype=self.mimetype
+        )
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 app.config.from_object(Config)
 
@@ -24,51 +53,128 @@ download_status = {
     'download_paused': False
 }
 
+# Guards download_status; the version is bumped on every change
+status_lock = threading.Lock()
+status_version = 0
+
 # Global variable to store downloader instance
 current_downloader = None
 
+# Worker pool running the background download tasks
+executor = ThreadPoolExecutor(max_workers=4)
+
+# Submitted download tasks by task id; finished tasks are dropped after TASK_TTL seconds
+TASK_TTL = 3600
+tasks: Dict[str, Future] = {}
+tasks_done_at: Dict[str, float] = {}
+tasks_lock = threading.Lock()
+
+# The most recently started task; a new download waits until it has finished, even
+# after a stop request, since it keeps writing download_status until it returns
+active_task: Optional[Future] = None
+
+# Short-lived cache of the /api/downloads listing
+DOWNLOADS_CACHE_TTL = 5
+downloads_cache = {'key': None, 'expires': 0.0, 'downloads': None}
+downloads_cache_lock = threading.Lock()
+
+def update_download_status(status_updates: Dict):
+    """Apply status updates under the lock and bump the status version"""
+    global status_version
+    with status_lock:
+        download_status.update(status_updates)
+        status_version += 1
+
+def prune_tasks():
+    """Forget finished tasks older than TASK_TTL; call with tasks_lock held"""
+    now = time.monotonic()
+    for task_id, future in list(tasks.items()):
+        if not future.done():
+            continue
+        done_at = tasks_done_at.setdefault(task_id, now)
+        if now - done_at > TASK_TTL:
+            del tasks[task_id]
+            del tasks_done_at[task_id]
+
 def run_download_task(fields_keywords: Dict[str, List[str]], custom_keywords: List[str] = None):
     """Run download task in background thread"""
-    global download_status
-    
-    def update_status(status_updates):
-        """Callback function to update global status"""
-        global download_status
-        download_status.update(status_updates)
-    
+    global current_downloader
+    downloader = None
     try:
-        download_status['is_running'] = True
-        download_status['progress'] = {}
-        download_status['results'] = {}
-        download_status['error'] = None
-        download_status['captcha_detected'] = False
-        download_status['captcha_message'] = None
-        download_status['download_paused'] = False
+        update_download_status({
+            'is_running': True,
+            'progress': {},
+            'results': {},
+            'error': None,
+            'captcha_detected': False,
+            'captcha_message': None,
+            'download_paused': False
+        })
         
         # Initialize downloader with status callback
-        downloader = PDFDownloader(status_callback=update_status)
+        downloader = PDFDownloader(status_callback=update_download_status)
         
         # Store downloader instance globally
-        global current_downloader
         current_downloader = downloader
         
         # Add custom keywords if provided
         if custom_keywords:
-            fields_keywords['custom'] = custom_keywords
+            fields_keywords = {**fields_keywords, 'custom': custom_keywords}
         
         # Start download process
         results = downloader.download_all_pdfs(fields_keywords)
         
-        download_status['results'] = results
-        download_status['is_running'] = False
-        
-        # Clean up downloader reference
-        current_downloader = None
+        update_download_status({'results': results, 'is_running': False})
+        return results
         
     except Exception as e:
-        download_status['error'] = str(e)
-        download_status['is_running'] = False
-        current_downloader = None
+        update_download_status({'error': str(e), 'is_running': False})
+        # Keep the error on the task's future for /api/download-status?task_id=
+        raise
+    finally:
+        # Clean up the downloader reference, unless it was already replaced or cleared
+        if downloader is not None and current_downloader is downloader:
+            current_downloader = None
+
+def scan_downloads(download_path: str) -> Dict:
+    """Build the {field: {keyword: {count, files}}} listing in a single scandir pass"""
+    downloads = {}
+    
+    with os.scandir(download_path) as field_entries:
+        for field_entry in field_entries:
+            if not field_entry.is_dir():
+                continue
+            
+            field_downloads = downloads[field_entry.name] = {}
+            with os.scandir(field_entry.path) as keyword_entries:
+                for keyword_entry in keyword_entries:
+                    if not keyword_entry.is_dir():
+                        continue
+                    
+                    with os.scandir(keyword_entry.path) as file_entries:
+                        pdf_files = [entry.name for entry in file_entries if entry.name.endswith('.pdf')]
+                    field_downloads[keyword_entry.name] = {
+                        'count': len(pdf_files),
+                        'files': pdf_files
+                    }
+    
+    return downloads
+
+def get_downloads(download_path: str) -> Dict:
+    """Return the downloads listing, reusing the cached one while it is fresh"""
+    key = (download_path, os.stat(download_path).st_mtime_ns)
+    now = time.monotonic()
+    
+    with downloads_cache_lock:
+        if downloads_cache['key'] == key and now < downloads_cache['expires']:
+            return downloads_cache['downloads']
+    
+    downloads = scan_downloads(download_path)
+    
+    with downloads_cache_lock:
+        downloads_cache.update(key=key, expires=now + DOWNLOADS_CACHE_TTL, downloads=downloads)
+    
+    return downloads
 
 @app.route('/')
 def index():
@@ -79,10 +185,7 @@ def index():
 @app.route('/api/start-download', methods=['POST'])
 def start_download():
     """Start PDF download process"""
-    global download_status
-    
-    if download_status['is_running']:
-        return jsonify({'error': 'Download already in progress'}), 400
+    global download_status, active_task
     
     try:
         data = request.get_json()
@@ -97,16 +200,21 @@ def start_download():
         if not selected_fields and not custom_keywords:
             return jsonify({'error': 'No fields or keywords selected'}), 400
         
-        # Start download in background thread
-        thread = threading.Thread(
-            target=run_download_task,
-            args=(selected_fields, custom_keywords)
-        )
-        thread.daemon = True
-        thread.start()
+        # Start download in the worker pool
+        with tasks_lock:
+            if download_status['is_running']:
+                return jsonify({'error': 'Download already in progress'}), 400
+            if active_task is not None and not active_task.done():
+                return jsonify({'error': 'Previous download is still stopping, please try again shortly'}), 400
+            update_download_status({'is_running': True})
+            
+            prune_tasks()
+            task_id = uuid.uuid4().hex
+            active_task = tasks[task_id] = executor.submit(run_download_task, selected_fields, custom_keywords)
         
         return jsonify({
             'message': 'Download started successfully',
+            'task_id': task_id,
             'selected_fields': list(selected_fields.keys()),
             'custom_keywords_count': len(custom_keywords)
         })
@@ -116,35 +224,54 @@ def start_download():
 
 @app.route('/api/download-status')
 def get_download_status():
-    """Get current download status"""
-    return jsonify(download_status)
+    """Get current download status, or the state of a single task when task_id is given
+    
+    Pass ?since=<version> from a previous response to get a 304 when nothing changed.
+    """
+    task_id = request.args.get('task_id')
+    if not task_id:
+        since = request.args.get('since', type=int)
+        with status_lock:
+            if since == status_version:
+                return '', 304
+            status = copy.deepcopy(download_status)
+            status['version'] = status_version
+        return jsonify(status)
+    
+    with tasks_lock:
+        prune_tasks()
+        future = tasks.get(task_id)
+    
+    if future is None:
+        return jsonify({'error': 'Task not found'}), 404
+    
+    task_status = {
+        'task_id': task_id,
+        'done': future.done(),
+        'results': None,
+        'error': None
+    }
+    if future.done():
+        exception = future.exception()
+        if exception is not None:
+            task_status['error'] = str(exception)
+        else:
+            task_status['results'] = future.result()
+    
+    return jsonify(task_status)
 
 @app.route('/api/fields')
 def get_fields():
     """Get available fields and keywords"""
     fields_keywords = Config.get_fields_keywords()
-    return jsonify(fields_keywords)
+    return jsonify(dict(fields_keywords))
 
 @app.route('/api/downloads')
 def list_downloads():
     """List all downloaded files"""
     try:
         download_path = Config.get_download_path()
-        downloads = {}
-        
-        if os.path.exists(download_path):
-            for field_dir in os.listdir(download_path):
-                field_path = os.path.join(download_path, field_dir)
-                if os.path.isdir(field_path):
-                    downloads[field_dir] = {}
-                    for keyword_dir in os.listdir(field_path):
-                        keyword_path = os.path.join(field_path, keyword_dir)
-                        if os.path.isdir(keyword_path):
-                            pdf_files = [f for f in os.listdir(keyword_path) if f.endswith('.pdf')]
-                            downloads[field_dir][keyword_dir] = {
-                                'count': len(pdf_files),
-                                'files': pdf_files
-                            }
+        downloads = get_downloads(download_path)
         
         return jsonify(downloads)
         
@@ -203,9 +330,11 @@ def resume_download():
         current_downloader.resume_download()
         
         # Reset CAPTCHA status
-        download_status['captcha_detected'] = False
-        download_status['captcha_message'] = None
-        download_status['download_paused'] = False
+        update_download_status({
+            'captcha_detected': False,
+            'captcha_message': None,
+            'download_paused': False
+        })
         
         return jsonify({
             'message': 'Download resumed successfully',
@@ -230,11 +359,13 @@ def stop_download():
             current_downloader = None
         
         # Update status to indicate download was stopped
-        download_status['is_running'] = False
-        download_status['captcha_detected'] = False
-        download_status['captcha_message'] = None
-        download_status['download_paused'] = False
-        download_status['error'] = 'Download stopped by user'
+        update_download_status({
+            'is_running': False,
+            'captcha_detected': False,
+            'captcha_message': None,
+            'download_paused': False,
+            'error': 'Download stopped by user'
+        })
         
         return jsonify({
             'message': 'Download stopped successfully',
@@ -120,17 +120,17 @@ def run_download(args) -> Dict:
     downloader = PDFDownloader(config)
     
     # Prepare fields and keywords
+    all_fields = config.get_fields_keywords()
     fields_keywords = {}
     
     if args.all_fields:
-        fields_keywords = config.get_fields_keywords()
+        fields_keywords = dict(all_fields)
     elif args.field:
-        all_fields = config.get_fields_keywords()
-        for field in args.field:
-            if field in all_fields:
-                fields_keywords[field] = all_fields[field]
-            else:
-                print(f"⚠️ Warning: Field '{field}' not found, skipping")
+        # Ordered and de-duplicated
+        requested = dict.fromkeys(args.field)
+        for field in requested.keys() - all_fields.keys():
+            print(f"⚠️ Warning: Field '{field}' not found, skipping")
+        fields_keywords = {field: all_fields[field] for field in requested if field in all_fields}
     
     # Add custom keywords
     if args.keywords:
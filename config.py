@@ -1,10 +1,21 @@
 import os
-from typing import Dict, List
+import sys
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+
+def _freeze_fields_keywords(fields_keywords: Dict[str, List[str]]) -> Mapping[str, Tuple[str, ...]]:
+    """Return a read-only copy of a fields/keywords mapping with interned keywords"""
+    return MappingProxyType({
+        field: tuple(sys.intern(keyword) for keyword in keywords)
+        for field, keywords in fields_keywords.items()
+    })
+
+
 class Config:
     """Configuration class for the PDF Downloader application"""
     
@@ -22,15 +33,24 @@ class Config:
     PAGE_LOAD_TIMEOUT = int(os.getenv('PAGE_LOAD_TIMEOUT', '10'))
     REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '15'))
     
+    # Largest PDF to download, in bytes
+    MAX_PDF_BYTES = int(os.getenv('MAX_PDF_BYTES', str(100 * 1024 * 1024)))
+    
+    # Concurrency settings
+    DOWNLOAD_WORKERS = int(os.getenv('DOWNLOAD_WORKERS', '8'))
+    KEYWORD_WORKERS = int(os.getenv('KEYWORD_WORKERS', '3'))
+    MAX_WORKERS = int(os.getenv('MAX_WORKERS', '16'))  # Upper bound for adaptive download concurrency
+    
     # Browser settings
     HEADLESS_MODE = os.getenv('HEADLESS_MODE', 'False').lower() == 'true'
     USER_AGENT_ROTATION = os.getenv('USER_AGENT_ROTATION', 'True').lower() == 'true'
+    CHROMEDRIVER_PATH = os.getenv('CHROMEDRIVER_PATH')  # Skip webdriver-manager when set
     
     # File storage
     BASE_DOWNLOAD_DIR = os.getenv('BASE_DOWNLOAD_DIR', 'downloads')
     
     # Default keywords by field
-    DEFAULT_FIELDS_KEYWORDS = {
+    DEFAULT_FIELDS_KEYWORDS = _freeze_fields_keywords({
         'english_security': [
             "International cybersecurity governance",
             "ENISA cybersecurity certification framework",
@@ -67,11 +87,14 @@ class Config:
             "Autonomous systems safety",
             "AI regulation frameworks",
         ]
-    }
+    })
     
     @classmethod
-    def get_fields_keywords(cls) -> Dict[str, List[str]]:
-        """Get keywords configuration, allowing for environment variable override"""
+    def get_fields_keywords(cls) -> Mapping[str, Tuple[str, ...]]:
+        """Get keywords configuration, allowing for environment variable override
+        
+        The result is read-only; copy it before adding fields.
+        """
         # You can override keywords via environment variable in the future
         return cls.DEFAULT_FIELDS_KEYWORDS
     
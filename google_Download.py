@@ -1,9 +1,20 @@
 import os
+import re
+import json
 import time
+import zlib
+import functools
+import threading
 import random
 import urllib.parse
 import requests
-import shutil
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from dotenv import load_dotenv
+from lxml import html
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -15,6 +26,9 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 # ---------- Settings ----------
 
+# Read optional settings (e.g. the search API credentials below) from .env
+load_dotenv()
+
 # List of keywords for each field
 fields_keywords = {
 'english_security' : [ 
@@ -45,25 +59,96 @@ fields_keywords = {
 # Maximum number of PDFs to download per keyword
 MAX_PDF = 200
 
+# Number of result pages to fetch per keyword
+MAX_PAGES = 4
+
+# Number of concurrent downloads
+MAX_WORKERS = 16
+
+# Read size used when streaming PDFs to disk
+CHUNK_SIZE = 64 * 1024
+
+# Bytes written between page-cache hints while streaming a PDF
+FADVISE_EVERY = 8 * 1024 * 1024
+
+# Links to PDF files, including upper-case extensions and query strings
+PDF_RE = re.compile(r'^https?://(?!www\.google\.)[^?#]+\.pdf(?:[?#]|$)', re.IGNORECASE)
+
+# Google hosts serving the /url redirect links
+GOOGLE_HOST_RE = re.compile(r'^(www\.)?google\.[a-z.]+$', re.IGNORECASE)
+
+# Google Custom Search JSON API credentials (optional)
+# When both are set, results come from the API and no browser is started
+GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
+GOOGLE_CSE_ID = os.getenv('GOOGLE_CSE_ID')
+CSE_URL = 'https://www.googleapis.com/customsearch/v1'
+
 # Base folder to save the PDFs
 SAVE_DIR = os.path.join(os.getcwd(), 'downloaded_pdfs')
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 # --------------------------------
 
-# Generate random User-Agent
-ua = UserAgent()
+# Shared HTTP session so connections are reused across requests
+session = requests.Session()
+# Transient server errors are retried; 429 is left to the robot-detection fallback
+retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=32, max_retries=retries)
+session.mount('http://', adapter)
+session.mount('https://', adapter)
+
+# Worker pool used to fetch result pages and PDFs concurrently
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+# Content checksums of the PDFs saved in the current field
+seen_hashes = set()
+hashes_lock = threading.Lock()
 
-chrome_options = webdriver.ChromeOptions()
-chrome_options.add_argument(f"user-agent={ua.random}")
-chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-chrome_options.add_experimental_option('useAutomationExtension', False)
-# chrome_options.add_argument("--headless")  # If needed, use Headless
+# Guards the per-keyword set of existing file names
+files_lock = threading.Lock()
 
-# Run the browser
-svc = ChromeService(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=svc, options=chrome_options)
+# Cached chromedriver location, refreshed once a day
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'webdriver', 'chromedriver_path')
+DRIVER_PATH_MAX_AGE = 24 * 60 * 60
+
+
+# Generate random User-Agent (loaded on first use)
+@functools.cache
+def get_user_agent():
+    return UserAgent()
+
+
+# Resolve chromedriver without hitting the network while the cached path is fresh
+def get_driver_path():
+    try:
+        if time.time() - os.path.getmtime(DRIVER_PATH_CACHE) < DRIVER_PATH_MAX_AGE:
+            with open(DRIVER_PATH_CACHE) as f:
+                driver_path = f.read().strip()
+            if os.path.exists(driver_path):
+                return driver_path
+    except OSError:
+        pass
+
+    driver_path = ChromeDriverManager().install()
+    os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+    with open(DRIVER_PATH_CACHE, 'w') as f:
+        f.write(driver_path)
+    return driver_path
+
+
+# The browser is only started when Google blocks the plain HTTP requests
+@functools.cache
+def get_driver():
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument(f"user-agent={get_user_agent().random}")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    # chrome_options.add_argument("--headless")  # If needed, use Headless
+
+    # Run the browser
+    svc = ChromeService(get_driver_path())
+    return webdriver.Chrome(service=svc, options=chrome_options)
 
 
 # Random wait
@@ -71,32 +156,208 @@ def random_sleep(a=2, b=5):
     time.sleep(random.uniform(a, b))
 
 # Check if the robot is detected
-def is_robot_detected(driver):
-    page_text = driver.page_source.lower()
+def is_robot_detected(page_source):
+    page_text = page_source.lower()
     return ("unusual traffic" in page_text or
             "i'm not a robot" in page_text or
             "automated queries" in page_text)
 
-# Save the PDF
-def save_pdf(url, save_path):
+# Check the page open in the browser; only a boolean is sent back over WebDriver
+ROBOT_CHECK_JS = """
+const text = document.body ? document.body.innerText.toLowerCase() : '';
+return ['unusual traffic', "i'm not a robot", 'automated queries'].some(p => text.includes(p));
+"""
+
+def is_robot_detected_in_browser(browser):
+    return bool(browser.execute_script(ROBOT_CHECK_JS))
+
+# Unwrap Google's /url?q=<target>&sa=... redirect links
+def unwrap_google_link(href):
+    parts = urllib.parse.urlsplit(href)
+    if parts.path == '/url' and (not parts.netloc or GOOGLE_HOST_RE.match(parts.netloc)):
+        return urllib.parse.parse_qs(parts.query).get('q', [''])[0]
+    return href
+
+# Extract the PDF links from a parsed result page
+def extract_pdf_links(tree):
+    pdf_links = set()
+    for href in tree.xpath("//a/@href"):
+        href = unwrap_google_link(href)
+        if PDF_RE.match(href):
+            pdf_links.add(href)
+    return pdf_links
+
+# Load a result page in the browser (used after robot detection)
+def fetch_serp_with_browser(target_url):
+    browser = get_driver()
+    browser.get(target_url)
+
+    # Check if the robot is detected
+    while is_robot_detected_in_browser(browser):
+        print("🚨 Robot detected! Please manually resolve the issue.")
+
+        # After manually resolving the issue, continue automatically
+        input("Enter after manually resolving the robot issue...")
+
+        print("✅ Restart after manual processing")
+        browser.get(target_url)
+
+    # Results are rendered server-side, so there is nothing to scroll into view
     try:
-        response = requests.get(url, timeout=15, stream=True)
-        if response.status_code == 200:
-            # Extract the original file name
-            original_filename = url.split('/')[-1]
-            original_filename = urllib.parse.unquote(original_filename)  # Decode
-            final_path = os.path.join(save_path, original_filename)
-
-            if not os.path.exists(final_path):  # Avoid duplicates
+        WebDriverWait(browser, 3).until(EC.presence_of_element_located((By.ID, "search")))
+    except Exception:
+        print("❗ Page loading failed")
+        return set()
+
+    # Parse the rendered page once instead of querying every link through the driver
+    return extract_pdf_links(html.fromstring(browser.page_source))
+
+# Fetch a single result page
+def fetch_serp(target_url):
+    try:
+        response = session.get(target_url, headers={"User-Agent": get_user_agent().random}, timeout=15)
+        page_source = response.text
+    except Exception as e:
+        print(f"❗ Page loading failed: {e}")
+        return set()
+
+    if response.status_code != 200 or is_robot_detected(page_source):
+        return None
+
+    # Consent redirects and JavaScript interstitials are 200 too; only a page with
+    # the results container (what the browser path waits for) is a real result page
+    tree = html.fromstring(page_source)
+    if not tree.xpath('//*[@id="search"]'):
+        return None
+    return extract_pdf_links(tree)
+
+# Fetch a single page of Custom Search API results (10 per page)
+def fetch_cse_page(search_query, page_num):
+    params = {
+        'key': GOOGLE_API_KEY,
+        'cx': GOOGLE_CSE_ID,
+        'q': search_query,
+        'start': page_num * 10 + 1,
+    }
+    try:
+        response = session.get(CSE_URL, params=params, timeout=15)
+        response.raise_for_status()
+        items = response.json().get('items', [])
+    except Exception as e:
+        print(f"❗ Search API request failed: {e}")
+        return set()
+
+    return {item['link'] for item in items if PDF_RE.match(item.get('link', ''))}
+
+# Collect the PDF links for a keyword
+def search_pdf_urls(keyword):
+    search_query = f"{keyword} filetype:pdf"
+
+    if GOOGLE_API_KEY and GOOGLE_CSE_ID:
+        pdf_urls = set()
+        for pdf_links in executor.map(lambda page_num: fetch_cse_page(search_query, page_num), range(MAX_PAGES)):
+            pdf_urls.update(pdf_links)
+        print(f"Current collected PDF links: {len(pdf_urls)}")
+        return pdf_urls
+
+    # Encode the query once and build every page URL from it
+    base_url = f"https://www.google.com/search?q={urllib.parse.quote(search_query, safe='')}"
+    target_urls = [f"{base_url}&start={offset}" for offset in range(0, MAX_PAGES * 10, 10)]
+
+    pdf_urls = set()
+    pages = executor.map(fetch_serp, target_urls)
+    for target_url, pdf_links in zip(target_urls, pages):
+        if pdf_links is None:
+            # Blocked by Google, fall back to the browser for this page
+            pdf_links = fetch_serp_with_browser(target_url)
+        pdf_urls.update(pdf_links)
+
+        print(f"Current collected PDF links: {len(pdf_urls)}")
+
+        if len(pdf_urls) >= MAX_PDF:
+            break
+
+    return pdf_urls
+
+# Save the PDF; True once the URL's content is on disk (saved now or a duplicate)
+def save_pdf(url, save_path, existing):
+    # Extract the original file name
+    original_filename = urllib.parse.urlsplit(url).path.split('/')[-1]
+    original_filename = urllib.parse.unquote(original_filename)  # Decode
+    final_path = save_path / original_filename
+
+    # Avoid duplicates without a stat() or a request per URL
+    with files_lock:
+        if original_filename in existing:
+            print(f"⚠️ Already exists: {final_path}")
+            return False
+        existing.add(original_filename)
+
+    saved = False
+    try:
+        # Closing the response returns its connection to the session pool
+        with session.get(url, timeout=15, stream=True) as response:
+            if response.status_code == 200:
+                checksum = 0
+                size = 0
+                # Saved PDFs are not read back, so keep them out of the page cache.
+                # DONTNEED only drops pages already written back, but it also starts
+                # writeback of dirty ones without waiting, so each hint while streaming
+                # drops what the previous ones sent to disk
+                advise = hasattr(os, 'posix_fadvise')
+                advised = 0
                 with open(final_path, 'wb') as f:
-                    shutil.copyfileobj(response.raw, f)
-                print(f"✅ Saved: {final_path}")
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        checksum = zlib.crc32(chunk, checksum)
+                        size += len(chunk)
+                        f.write(chunk)
+                        if advise and size - advised >= FADVISE_EVERY:
+                            f.flush()
+                            os.posix_fadvise(f.fileno(), 0, size, os.POSIX_FADV_DONTNEED)
+                            advised = size
+
+                    if advise:
+                        f.flush()
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+                saved = True
+
+                # Same content already saved under another name (mirrored PDFs)
+                content_hash = f"{size}-{checksum:08x}"
+                with hashes_lock:
+                    is_duplicate = content_hash in seen_hashes
+                    seen_hashes.add(content_hash)
+
+                if is_duplicate:
+                    os.remove(final_path)
+                    print(f"⚠️ Duplicate content: {url}")
+                else:
+                    print(f"✅ Saved: {final_path}")
+                return True
             else:
-                print(f"⚠️ Already exists: {final_path}")
-        else:
-            print(f"⚠️ Download failed: {url}")
+                print(f"⚠️ Download failed: {url}")
     except Exception as e:
         print(f"❗ Request failed: {url} - {e}")
+    finally:
+        # Let another URL with the same file name try again
+        if not saved:
+            with files_lock:
+                existing.discard(original_filename)
+    return False
+
+# Load an index (content checksums, seen URLs) saved for a field
+def load_index(field_folder, filename):
+    try:
+        with open(os.path.join(field_folder, filename)) as f:
+            return set(json.load(f))
+    except (OSError, ValueError):
+        return set()
+
+# Save an index for a field
+def save_index(field_folder, filename, values):
+    with open(os.path.join(field_folder, filename), 'w') as f:
+        json.dump(sorted(values), f)
+        f.flush()
+        os.fsync(f.fileno())
 
 # ▶ Keyword-based work
 for field, keywords in fields_keywords.items():
@@ -106,66 +367,39 @@ for field, keywords in fields_keywords.items():
     field_folder = os.path.join(SAVE_DIR, field.replace(' ', '_'))
     os.makedirs(field_folder, exist_ok=True)
 
-    for keyword in keywords:
-        print(f"\n🔍 Search started: {keyword}")
-
-        search_query = f"{keyword} filetype:pdf"
-        base_url = f"https://www.google.com/search?q={urllib.parse.quote(search_query)}"
-
-        pdf_urls = set()
-        page_num = 0
+    seen_hashes = load_index(field_folder, '.hashes.json')
 
-        while len(pdf_urls) < MAX_PDF:
-            target_url = base_url + f"&start={page_num * 10}"
-            driver.get(target_url)
+    # URLs whose content is saved for this field, shared by all its keywords
+    seen_urls = load_index(field_folder, '.seen_urls.json')
 
-            # Check if the robot is detected
-            if is_robot_detected(driver):
-                print("🚨 Robot detected! Please manually resolve the issue.")
-                
-                # After manually resolving the issue, continue automatically
-                input("Enter after manually resolving the robot issue...")
+    # URLs already tried in this run; failures are retried by the next run only
+    tried_urls = set()
 
-                print("✅ Restart after manual processing")
-
-                # After manually resolving the issue, continue automatically
-                continue  # Continue (handle the page with robot detection)
-
-            try:
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "a")))
-
-            except:
-                print("❗ Page loading failed")
-                break
-
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            random_sleep(2, 4)
-
-            links = driver.find_elements(By.CSS_SELECTOR, "a")
-            for link in links:
-                href = link.get_attribute('href')
-                if href and href.endswith('.pdf'):
-                    pdf_urls.add(href)
-
-            print(f"Current collected PDF links: {len(pdf_urls)}")
-
-            page_num += 1
-            random_sleep(3, 6)
+    for keyword in keywords:
+        print(f"\n🔍 Search started: {keyword}")
 
-            if page_num > 3:
-                print("❗ Too many pages searched, stopping.")
-                break
+        pdf_urls = search_pdf_urls(keyword)
+        new_urls = pdf_urls - seen_urls - tried_urls
+        tried_urls.update(new_urls)
 
-        print(f"Total {len(pdf_urls)} PDF links collected. Download started!")
+        print(f"Total {len(pdf_urls)} PDF links collected, {len(new_urls)} new. Download started!")
 
         # Create the keyword folder
-        keyword_folder = os.path.join(field_folder, keyword.replace(' ', '_'))
-        os.makedirs(keyword_folder, exist_ok=True)
+        keyword_folder = Path(field_folder, keyword.replace(' ', '_'))
+        keyword_folder.mkdir(parents=True, exist_ok=True)
+
+        # File names already in the keyword folder
+        existing = set(os.listdir(keyword_folder))
 
-        for pdf_url in pdf_urls:
-            save_pdf(pdf_url, keyword_folder)
+        futures = {executor.submit(save_pdf, pdf_url, keyword_folder, existing): pdf_url for pdf_url in new_urls}
+        wait(futures)
+        seen_urls.update(pdf_url for future, pdf_url in futures.items() if future.result())
+        save_index(field_folder, '.hashes.json', seen_hashes)
+        save_index(field_folder, '.seen_urls.json', seen_urls)
 
         random_sleep(5, 10)
 
-driver.quit()
+executor.shutdown()
+if get_driver.cache_info().currsize:
+    get_driver().quit()
 print("\n🎉 All work completed!")
@@ -1,12 +1,17 @@
 import os
+import re
 import time
+import itertools
 import random
 import urllib.parse
 import requests
-import shutil
 import logging
-from typing import Set, List, Dict, Optional
+import threading
+from typing import Set, List, Dict, Iterator, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from lxml import html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -23,36 +28,251 @@ from config import Config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Number of saved URLs buffered before the seen-URL file is flushed
+SEEN_URLS_FLUSH_EVERY = 20
+
+# Content types servers commonly use for PDF files
+PDF_CONTENT_TYPES = ('application/pdf', 'application/x-pdf', 'application/octet-stream')
+
+
+class BrowserClosedError(RuntimeError):
+    """A keyword worker's browser was closed or crashed"""
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on concurrent downloads, tuned from the measured throughput
+    
+    After every `interval` seconds spent with at least one download active, the
+    throughput of that window is compared with the previous one: the limit grows by one
+    while throughput keeps improving and shrinks by one when it drops. Idle time (search
+    pages, sleeps) is left out of the windows. Timeouts and 429 responses halve it.
+    """
+    
+    def __init__(self, initial: int, maximum: int, interval: float = 5.0):
+        self.maximum = max(1, maximum)
+        self.limit = min(max(1, initial), self.maximum)
+        self.interval = interval
+        self._active = 0
+        self._cond = threading.Condition()
+        self._busy_since = 0.0  # When the current busy stretch began (valid while _active > 0)
+        self._window_busy = 0.0  # Busy seconds of the current window, up to _busy_since
+        self._window_bytes = 0
+        self._last_rate = 0.0
+        self._last_backoff = 0.0
+    
+    def acquire(self):
+        """Wait for a free download slot"""
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            if self._active == 0:
+                self._busy_since = time.monotonic()
+            self._active += 1
+    
+    def release(self):
+        """Give a download slot back"""
+        with self._cond:
+            self._active -= 1
+            if self._active == 0:
+                self._window_busy += time.monotonic() - self._busy_since
+            self._cond.notify()
+    
+    def record(self, nbytes: int):
+        """Count downloaded bytes and retune the limit at the end of each window"""
+        with self._cond:
+            self._window_bytes += nbytes
+            now = time.monotonic()
+            elapsed = self._window_busy + (now - self._busy_since if self._active else 0.0)
+            if elapsed < self.interval:
+                return
+            
+            rate = self._window_bytes / elapsed
+            if rate > self._last_rate * 1.05 and self.limit < self.maximum:
+                self.limit += 1
+                self._cond.notify()
+                logger.debug(f"⬆️ Download concurrency raised to {self.limit} ({rate / 1e6:.2f} MB/s)")
+            elif rate < self._last_rate * 0.8 and self.limit > 1:
+                self.limit -= 1
+                logger.debug(f"⬇️ Download concurrency lowered to {self.limit} ({rate / 1e6:.2f} MB/s)")
+            
+            self._last_rate = rate
+            self._window_busy = 0.0
+            self._busy_since = now
+            self._window_bytes = 0
+    
+    def backoff(self):
+        """Halve the limit after a timeout or rate limiting, at most once per window"""
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_backoff < self.interval:
+                return
+            self._last_backoff = now
+            self.limit = max(1, self.limit // 2)
+            logger.info(f"⬇️ Download concurrency reduced to {self.limit} after timeouts/rate limiting")
+
 
 class PDFDownloader:
     """Main class for downloading PDFs from Google search results"""
     
+    # Phrases shown on Google's robot check, matched in a single pass
+    _robot_re = re.compile(
+        r"unusual traffic|i['’]?m not a robot|automated queries|captcha|verify you['’]?re human",
+        re.IGNORECASE
+    )
+    
+    # Checks the open page in the browser for a CAPTCHA widget or a robot-check phrase
+    # (arguments[0] is _robot_re's pattern); only a boolean comes back over WebDriver
+    _robot_check_js = (
+        "if (document.querySelector('form#captcha-form, #recaptcha, iframe[src*=\"recaptcha\"]')) return true;"
+        "const text = document.body ? document.body.innerText : '';"
+        "return new RegExp(arguments[0], 'i').test(text);"
+    )
+    
+    # Resolved chromedriver binary, shared by every downloader in the process
+    _driver_path: Optional[str] = None
+    _driver_path_lock = threading.Lock()
+    
     def __init__(self, config: Config = None, status_callback=None):
         self.config = config or Config()
+        
+        # Each keyword worker thread drives its own browser; all of them are tracked for shutdown
+        self._local = threading.local()
+        self._drivers: List[webdriver.Chrome] = []
+        self._drivers_lock = threading.Lock()
+        self._status_lock = threading.Lock()
+        
+        # Keyword workers share the console, so CLI CAPTCHA prompts are asked one at a time
+        self._prompt_lock = threading.Lock()
+        
         self.driver = None
         self.ua = UserAgent() if self.config.USER_AGENT_ROTATION else None
+        
+        # Sample user agents once and rotate through them instead of querying fake_useragent per request
+        self._ua_pool = tuple(self.ua.random for _ in range(16)) if self.ua else ()
+        self._ua_counter = itertools.count()
         self.download_path = self.config.get_download_path()
         self.status_callback = status_callback
-        self.should_resume = False
-        self.should_stop = False
+        self._stop_event = threading.Event()
+        
+        # Every resume bumps the generation, releasing exactly the CAPTCHA waits that saw
+        # the previous one; a shared Event could be cleared by a worker that starts waiting
+        self._resume_cond = threading.Condition()
+        self._resume_generation = 0
+        
+        # Shared HTTP session so downloads reuse keep-alive connections
+        self.session = self._setup_session()
+        
+        # Result pages get their own session: a 429 from Google goes straight to the browser
+        # fallback instead of being retried
+        self.search_session = self._setup_session(status_forcelist=[500, 502, 503, 504])
+        
+        # URLs saved by this and earlier runs, persisted one per line
+        self._seen_path = os.path.join(self.download_path, '.seen_urls')
+        self._seen_urls = self._load_seen_urls()
+        self._seen_file = None
+        self._seen_pending = 0
+        self._seen_lock = threading.Lock()
         
+        # Concurrent downloads, adjusted to the measured throughput
+        self._concurrency = AdaptiveConcurrency(
+            initial=self.config.DOWNLOAD_WORKERS or 8,
+            maximum=self.config.MAX_WORKERS or 16
+        )
+        
+        # Folders already created by this downloader
+        self._mkdir_cache: Set[str] = set()
+        
+        # Guards the per-folder sets of existing and claimed file names
+        self._files_lock = threading.Lock()
+    
+    @property
+    def driver(self) -> Optional[webdriver.Chrome]:
+        """The browser used by the current thread"""
+        return getattr(self._local, 'driver', None)
+    
+    @driver.setter
+    def driver(self, driver: Optional[webdriver.Chrome]):
+        self._local.driver = driver
+    
+    @property
+    def should_stop(self) -> bool:
+        """Whether a stop was requested"""
+        return self._stop_event.is_set()
+    
+    def _update_status(self, status_updates: Dict):
+        """Report status to the callback, one update at a time"""
+        if self.status_callback:
+            with self._status_lock:
+                self.status_callback(status_updates)
+        
+    def _next_ua(self) -> Optional[str]:
+        """Return the next user agent from the pool, or None when rotation is disabled"""
+        if not self._ua_pool:
+            return None
+        return self._ua_pool[next(self._ua_counter) % len(self._ua_pool)]
+    
+    def _ua_headers(self) -> Dict[str, str]:
+        """Request headers carrying the next user agent"""
+        user_agent = self._next_ua()
+        return {'User-Agent': user_agent} if user_agent else {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Release the pooled HTTP connections and flush the seen-URL file"""
+        self.session.close()
+        self.search_session.close()
+        with self._seen_lock:
+            if self._seen_file is not None:
+                self._seen_file.close()
+                self._seen_file = None
+                self._seen_pending = 0
+    
+    def _load_seen_urls(self) -> Set[str]:
+        """Load the URLs saved by earlier runs"""
+        try:
+            with open(self._seen_path, encoding='utf-8') as f:
+                return set(f.read().splitlines())
+        except FileNotFoundError:
+            return set()
+    
+    def _mark_seen(self, url: str):
+        """Record a saved URL, appending it to the seen-URL file"""
+        with self._seen_lock:
+            self._seen_urls.add(url)
+            if self._seen_file is None:
+                self._seen_file = open(self._seen_path, 'a', encoding='utf-8')
+            self._seen_file.write(url + '\n')
+            self._seen_pending += 1
+            if self._seen_pending >= SEEN_URLS_FLUSH_EVERY:
+                self._seen_file.flush()
+                self._seen_pending = 0
+    
     def resume_download(self):
-        """Set flag to resume download after CAPTCHA"""
-        self.should_resume = True
+        """Wake the downloads waiting on a CAPTCHA"""
+        with self._resume_cond:
+            self._resume_generation += 1
+            self._resume_cond.notify_all()
         logger.info("🔄 Resume flag set - download will continue")
     
     def stop_download(self):
         """Set flag to stop download"""
-        self.should_stop = True
+        self._stop_event.set()
+        # Release the downloads waiting on a CAPTCHA so they can see the stop flag
+        with self._resume_cond:
+            self._resume_cond.notify_all()
         logger.info("🛑 Stop flag set - download will be terminated")
         
-        # Close the browser if it's open
-        if self.driver:
-            try:
-                self.driver.quit()
+        # Close every open browser, whichever worker thread owns it
+        with self._drivers_lock:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            if self._quit_driver(driver):
                 logger.info("🔒 Browser closed due to stop request")
-            except Exception as e:
-                logger.warning(f"⚠️ Error closing browser: {e}")
     
     def _is_browser_responsive(self) -> bool:
         """Check if the browser is still responsive"""
@@ -66,44 +286,110 @@ class PDFDownloader:
             return False
     
     def _handle_browser_closure(self):
-        """Handle unexpected browser closure"""
-        if self.status_callback:
-            self.status_callback({
-                'is_running': False,
-                'captcha_detected': False,
-                'captcha_message': None,
-                'download_paused': False,
-                'error': 'Download process stopped - browser was closed unexpectedly'
-            })
+        """Handle unexpected browser closure
+        
+        In a keyword worker only that worker's browser is gone: it is dropped (the next
+        page that needs one starts a new browser) and the keyword fails with BrowserClosedError,
+        while the other workers and the global status carry on.
+        """
+        if getattr(self._local, 'is_worker', False):
+            if self.driver is not None:
+                self._quit_driver(self.driver)
+                self.driver = None
+            logger.error("🚨 Browser of a keyword worker was closed unexpectedly - skipping keyword")
+            raise BrowserClosedError('Browser was closed unexpectedly')
+        
+        self._update_status({
+            'is_running': False,
+            'captcha_detected': False,
+            'captcha_message': None,
+            'download_paused': False,
+            'error': 'Download process stopped - browser was closed unexpectedly'
+        })
         logger.error("🚨 Browser was closed unexpectedly - download process stopped")
     
+    def _setup_session(self, status_forcelist: List[int] = None) -> requests.Session:
+        """Create an HTTP session with pooled connections and retries"""
+        session = requests.Session()
+        status_forcelist = status_forcelist or [429, 500, 502, 503, 504]
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=status_forcelist)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def _get_driver_path(self) -> str:
+        """Resolve the chromedriver binary, installing it at most once per process"""
+        if self.config.CHROMEDRIVER_PATH:
+            return self.config.CHROMEDRIVER_PATH
+        
+        with PDFDownloader._driver_path_lock:
+            if PDFDownloader._driver_path is None:
+                PDFDownloader._driver_path = ChromeDriverManager().install()
+            return PDFDownloader._driver_path
+    
     def _setup_driver(self) -> webdriver.Chrome:
         """Initialize and configure Chrome WebDriver"""
         chrome_options = ChromeOptions()
         
         if self.config.USER_AGENT_ROTATION:
-            chrome_options.add_argument(f"user-agent={self.ua.random}")
+            chrome_options.add_argument(f"user-agent={self._next_ua()}")
         
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
+        # Images are needed to solve a CAPTCHA by hand, so only skip them headless
+        content_settings = {"profile.default_content_setting_values.notifications": 2}
         if self.config.HEADLESS_MODE:
             chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            content_settings["profile.managed_default_content_settings.images"] = 2
+        chrome_options.add_experimental_option("prefs", content_settings)
         
         # Additional options for better performance
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-sync")
+        chrome_options.add_argument("--disable-translate")
+        chrome_options.add_argument("--disable-default-apps")
+        chrome_options.add_argument("--mute-audio")
         
-        svc = ChromeService(ChromeDriverManager().install())
+        # Return from driver.get() on DOMContentLoaded instead of the full page load
+        chrome_options.page_load_strategy = 'eager'
+        
+        svc = ChromeService(self._get_driver_path())
         driver = webdriver.Chrome(service=svc, options=chrome_options)
         
         # Execute script to avoid detection
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
+        with self._drivers_lock:
+            self._drivers.append(driver)
         return driver
     
+    def _ensure_driver(self) -> webdriver.Chrome:
+        """Return the current thread's browser, starting it on first use"""
+        if self.driver is None:
+            self.driver = self._setup_driver()
+        return self.driver
+    
+    def _quit_driver(self, driver: webdriver.Chrome) -> bool:
+        """Close a browser started by _setup_driver; False if it was already closed"""
+        with self._drivers_lock:
+            if driver not in self._drivers:
+                return False
+            self._drivers.remove(driver)
+        
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing browser: {e}")
+        return True
+    
     def _random_sleep(self, min_time: float = None, max_time: float = None):
         """Random sleep to avoid detection"""
         min_t = min_time or self.config.MIN_SLEEP_TIME
@@ -111,151 +397,314 @@ class PDFDownloader:
         time.sleep(random.uniform(min_t, max_t))
     
     def _is_robot_detected(self, driver: webdriver.Chrome) -> bool:
-        """Check if the robot is detected by Google"""
-        page_text = driver.page_source.lower()
-        detection_phrases = [
-            "unusual traffic",
-            "i'm not a robot",
-            "automated queries",
-            "captcha",
-            "verify you're human"
-        ]
-        return any(phrase in page_text for phrase in detection_phrases)
-    
-    def _handle_captcha_detection(self, driver: webdriver.Chrome) -> bool:
+        """Check if the robot is detected by Google, without fetching the page source"""
+        return bool(driver.execute_script(self._robot_check_js, self._robot_re.pattern))
+    
+    def _is_robot_page(self, page_source: str) -> bool:
+        """Check if a page is Google's robot check"""
+        return self._robot_re.search(page_source) is not None
+    
+    def _wait_for_resume(self, generation: int, timeout: float) -> bool:
+        """Wait until a resume newer than `generation` or a stop; False on timeout"""
+        with self._resume_cond:
+            return self._resume_cond.wait_for(
+                lambda: self._resume_generation != generation or self.should_stop,
+                timeout=timeout
+            )
+    
+    def _handle_captcha_detection(self, driver: webdriver.Chrome, keyword: str) -> bool:
         """Handle CAPTCHA detection and wait for resolution"""
         if self.status_callback:
             # Update status to indicate CAPTCHA detected
-            self.status_callback({
+            self._update_status({
                 'captcha_detected': True,
                 'captcha_message': 'CAPTCHA detected! Please solve it manually and click Resume.',
                 'download_paused': True
             })
             
-            # Wait for CAPTCHA to be resolved
-            while True:
-                # Check if user wants to resume
-                if self.should_resume:
-                    self.should_resume = False
-                    self.status_callback({
-                        'captcha_detected': False,
-                        'captcha_message': None,
-                        'download_paused': False
-                    })
-                    logger.info("✅ Download resumed by user")
-                    return True
-                
+            # Wait for the user to resume; the page itself is only rechecked every 10 seconds
+            with self._resume_cond:
+                generation = self._resume_generation
+            while not self._wait_for_resume(generation, timeout=10):
                 # Check if CAPTCHA is still present
                 if not self._is_robot_detected(driver):
                     # CAPTCHA resolved automatically, update status
-                    self.status_callback({
+                    self._update_status({
                         'captcha_detected': False,
                         'captcha_message': None,
                         'download_paused': False
                     })
                     logger.info("✅ CAPTCHA resolved automatically, continuing download")
                     return True
-                
-                # Wait a bit before checking again
-                time.sleep(2)
+            
+            if self.should_stop:
+                return False
+            
+            self._update_status({
+                'captcha_detected': False,
+                'captcha_message': None,
+                'download_paused': False
+            })
+            logger.info("✅ Download resumed by user")
+            return True
         else:
-            # Fallback to console input for CLI usage
-            logger.warning("🚨 Robot detected! Please manually resolve the issue.")
-            input("Press Enter after manually resolving the robot issue...")
-            logger.info("✅ Continuing after manual resolution")
+            # Fallback to console input for CLI usage, one prompt at a time
+            with self._prompt_lock:
+                logger.warning(f"🚨 Robot detected while searching '{keyword}'! Please manually resolve the issue.")
+                input(f"Press Enter after manually resolving the robot issue for '{keyword}'...")
+                logger.info("✅ Continuing after manual resolution")
             return True
     
-    def _save_pdf(self, url: str, save_path: str) -> bool:
-        """Download and save a PDF file"""
+    def _save_pdf(self, url: str, save_path: str, existing: Set[str]) -> bool:
+        """Download and save a PDF file (safe to call from several threads)
+        
+        `existing` holds the file names already in save_path; names being downloaded
+        are added to it so two workers never write the same file.
+        """
+        if self.should_stop:
+            return False
+        
+        # Saved by an earlier run; skip without touching the network or the disk
+        if url in self._seen_urls:
+            logger.info(f"⚠️ Already downloaded: {url}")
+            return False
+        
+        # Extract the original file name
+        original_filename = url.split('/')[-1]
+        original_filename = urllib.parse.unquote(original_filename)
+        final_path = os.path.join(save_path, original_filename)
+        part_path = final_path + '.part'
+        
+        # Claim the file name; a set lookup instead of a stat() per URL
+        with self._files_lock:
+            if original_filename in existing:  # Avoid duplicates
+                logger.info(f"⚠️ Already exists: {final_path}")
+                return False
+            existing.add(original_filename)
+        saved = False
+        
+        self._concurrency.acquire()
         try:
-            response = requests.get(url, timeout=self.config.REQUEST_TIMEOUT, stream=True)
-            if response.status_code == 200:
-                # Extract the original file name
-                original_filename = url.split('/')[-1]
-                original_filename = urllib.parse.unquote(original_filename)
-                final_path = os.path.join(save_path, original_filename)
-                
-                if not os.path.exists(final_path):  # Avoid duplicates
-                    with open(final_path, 'wb') as f:
-                        shutil.copyfileobj(response.raw, f)
-                    logger.info(f"✅ Saved: {final_path}")
-                    return True
-                else:
-                    logger.info(f"⚠️ Already exists: {final_path}")
-                    return False
-            else:
-                logger.warning(f"⚠️ Download failed: {url} - Status: {response.status_code}")
+            if self.should_stop:
                 return False
+            
+            # PDFs are already compressed, so skip transfer encoding
+            headers = {**self._ua_headers(), 'Accept-Encoding': 'identity'}
+            
+            # Resume a partial file left behind by an interrupted download
+            resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if resume_from:
+                headers['Range'] = f'bytes={resume_from}-'
+            
+            while True:
+                # Closing the response hands its connection back to the pool
+                with self.session.get(url, headers=headers, timeout=self.config.REQUEST_TIMEOUT, stream=True) as response:
+                    # Range not satisfiable: the partial file may already hold the whole PDF
+                    if response.status_code == 416 and resume_from:
+                        if self._content_range_length(response) == resume_from:
+                            break
+                        logger.warning(f"⚠️ Cannot resume, downloading again: {url}")
+                        os.remove(part_path)
+                        resume_from = 0
+                        headers.pop('Range', None)
+                        continue
+                    
+                    if response.status_code not in (200, 206):
+                        if response.status_code == 429:
+                            self._concurrency.backoff()
+                        logger.warning(f"⚠️ Download failed: {url} - Status: {response.status_code}")
+                        return False
+                    
+                    # Check the headers before reading the body: skip HTML landing pages and huge files
+                    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                    if content_type and content_type not in PDF_CONTENT_TYPES:
+                        logger.warning(f"⚠️ Not a PDF: {url} - Content-Type: {content_type}")
+                        return False
+                    
+                    # Only append a 206 that starts exactly where the partial file ends; if the file
+                    # changed on the server or the range wasn't honoured, fetch it whole instead
+                    append = response.status_code == 206
+                    if append and self._content_range_start(response) != resume_from:
+                        if not resume_from:
+                            logger.warning(f"⚠️ Download failed: {url} - Unexpected partial content")
+                            return False
+                        logger.warning(f"⚠️ Cannot resume, downloading again: {url}")
+                        os.remove(part_path)
+                        resume_from = 0
+                        headers.pop('Range', None)
+                        continue
+                    
+                    # 206 continues the partial file, 200 means the server sent it all again
+                    size = resume_from if append else 0
+                    max_bytes = self.config.MAX_PDF_BYTES
+                    if size + int(response.headers.get('Content-Length') or 0) > max_bytes:
+                        logger.warning(f"⚠️ Too large: {url}")
+                        return False
+                    
+                    mode = 'ab' if append else 'wb'
+                    with open(part_path, mode, buffering=1024 * 1024) as f:
+                        # Bound once so the chunk loop does no attribute lookups
+                        write = f.write
+                        record = self._concurrency.record
+                        for chunk in response.iter_content(chunk_size=256 * 1024):
+                            if chunk:
+                                write(chunk)
+                                size += len(chunk)
+                                record(len(chunk))
+                                # Content-Length may be missing, so enforce the limit while streaming
+                                if size > max_bytes:
+                                    break
+                    
+                    if size > max_bytes:
+                        os.remove(part_path)
+                        logger.warning(f"⚠️ Too large: {url}")
+                        return False
+                
+                break
+            
+            # Only complete files get the final name
+            os.replace(part_path, final_path)
+            saved = True
+            self._mark_seen(url)
+            logger.info(f"✅ Saved: {final_path}")
+            return True
+        except (requests.exceptions.Timeout, requests.exceptions.RetryError) as e:
+            # The server or the link is saturated: back off
+            self._concurrency.backoff()
+            logger.error(f"❗ Request failed: {url} - {e}")
+            return False
         except Exception as e:
             logger.error(f"❗ Request failed: {url} - {e}")
             return False
+        finally:
+            self._concurrency.release()
+            if not saved:
+                # Release the claim so another URL may still provide this file
+                with self._files_lock:
+                    existing.discard(original_filename)
+    
+    @staticmethod
+    def _content_range_start(response: requests.Response) -> Optional[int]:
+        """First byte position of a 206 response's Content-Range, None when missing or invalid"""
+        match = re.match(r'bytes\s+(\d+)-', response.headers.get('Content-Range', ''))
+        return int(match.group(1)) if match else None
+    
+    @staticmethod
+    def _content_range_length(response: requests.Response) -> Optional[int]:
+        """Complete length from a Content-Range header (e.g. a 416's "bytes */1234"), None when unknown"""
+        match = re.search(r'/(\d+)\s*$', response.headers.get('Content-Range', ''))
+        return int(match.group(1)) if match else None
     
-    def _search_pdf_urls(self, keyword: str, max_pdfs: int = None) -> Set[str]:
-        """Search for PDF URLs using Google search"""
+    def _extract_pdf_links(self, tree: html.HtmlElement) -> Set[str]:
+        """Extract PDF links from a parsed results page, unwrapping Google's /url?q= redirects"""
+        pdf_links = set()
+        for href in tree.xpath("//a/@href"):
+            if href.startswith('/url?'):
+                href = urllib.parse.parse_qs(urllib.parse.urlsplit(href).query).get('q', [''])[0]
+            if href.endswith('.pdf'):
+                pdf_links.add(href)
+        return pdf_links
+    
+    def _search_pdf_urls_http(self, target_url: str) -> Optional[Set[str]]:
+        """Fetch a results page without the browser; None when it isn't a usable results page"""
+        headers = self._ua_headers()
+        try:
+            response = self.search_session.get(target_url, headers=headers, timeout=self.config.REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            logger.warning(f"⚠️ Search request failed, using the browser: {e}")
+            return None
+        
+        if response.status_code != 200 or self._is_robot_page(response.text):
+            return None
+        
+        # Consent redirects and JavaScript interstitials come back as 200 too; only a page
+        # with the results container (the element the browser path waits for) counts
+        tree = html.fromstring(response.text)
+        if not tree.xpath('//*[@id="search"]'):
+            return None
+        return self._extract_pdf_links(tree)
+    
+    def _search_pdf_urls_iter(self, keyword: str, max_pdfs: int = None) -> Iterator[str]:
+        """Search for PDF URLs using Google search, yielding new ones page by page"""
         max_pdfs = max_pdfs or self.config.MAX_PDF_PER_KEYWORD
+        max_pages = self.config.MAX_PAGES_PER_SEARCH
+        page_load_timeout = self.config.PAGE_LOAD_TIMEOUT
         pdf_urls = set()
         page_num = 0
+        offset = 0
         
+        # Encode the query once; each page only appends its result offset
         search_query = f"{keyword} filetype:pdf"
-        base_url = f"https://www.google.com/search?q={urllib.parse.quote(search_query)}"
+        base_url = f"https://www.google.com/search?q={urllib.parse.quote(search_query, safe='')}"
         
         logger.info(f"🔍 Searching for: {keyword}")
         
-        while len(pdf_urls) < max_pdfs and page_num < self.config.MAX_PAGES_PER_SEARCH:
+        while len(pdf_urls) < max_pdfs and page_num < max_pages:
             # Check if download should be stopped
             if self.should_stop:
                 logger.info("🛑 Download stopped by user")
-                return pdf_urls
+                return
             
-            target_url = base_url + f"&start={page_num * 10}"
+            target_url = f"{base_url}&start={offset}"
             
             try:
-                self.driver.get(target_url)
-                
-                # Check if browser is still responsive
-                if not self._is_browser_responsive():
-                    self._handle_browser_closure()
-                    return pdf_urls
-                
-                # Check for robot detection
-                if self._is_robot_detected(self.driver):
-                    self._handle_captcha_detection(self.driver)
-                    continue
-                
-                # Wait for page to load
-                WebDriverWait(self.driver, self.config.PAGE_LOAD_TIMEOUT).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "a"))
-                )
-                
-                # Scroll to load more content
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                self._random_sleep(2, 4)
+                # Plain HTTP first; the browser is only needed once Google shows a CAPTCHA
+                page_urls = self._search_pdf_urls_http(target_url)
                 
-                # Extract PDF links
-                links = self.driver.find_elements(By.CSS_SELECTOR, "a")
-                for link in links:
-                    href = link.get_attribute('href')
-                    if href and href.endswith('.pdf'):
-                        pdf_urls.add(href)
+                if page_urls is None:
+                    # The browser is only started once a page needs it
+                    driver = self._ensure_driver()
+                    driver.get(target_url)
+                    
+                    # Check if browser is still responsive
+                    if not self._is_browser_responsive():
+                        self._handle_browser_closure()
+                        return
+                    
+                    # Check for robot detection
+                    if self._is_robot_detected(driver):
+                        self._handle_captcha_detection(driver, keyword)
+                        continue
+                    
+                    # Wait for the results container; filetype:pdf results are
+                    # rendered server-side, so no scrolling is needed
+                    WebDriverWait(driver, page_load_timeout).until(
+                        EC.presence_of_element_located((By.ID, "search"))
+                    )
+                    
+                    # Extract PDF links in the page itself, in a single WebDriver call
+                    page_urls = set(driver.execute_script(
+                        "return Array.from(document.querySelectorAll('a[href$=\".pdf\"]'), a => a.href);"
+                    ))
                 
+                new_urls = page_urls - pdf_urls
+                pdf_urls.update(new_urls)
                 logger.info(f"📄 Found {len(pdf_urls)} PDF links so far")
                 
                 page_num += 1
-                self._random_sleep(3, 6)
-                
+                offset += 10
+            except BrowserClosedError:
+                raise
             except Exception as e:
+                # WebDriver calls on a closed browser fail; report that as a closure
+                if self.driver is not None and not self.should_stop and not self._is_browser_responsive():
+                    self._handle_browser_closure()
+                    return
                 logger.error(f"❗ Error on page {page_num}: {e}")
                 break
+            
+            # Outside the try: errors raised by the consumer must not be reported as page errors
+            yield from new_urls
+            self._random_sleep(3, 6)
         
         logger.info(f"📊 Total PDF links collected: {len(pdf_urls)}")
-        return pdf_urls
     
     def download_pdfs_for_keyword(self, keyword: str, field_name: str, max_pdfs: int = None) -> Dict[str, any]:
         """Download PDFs for a specific keyword"""
         max_pdfs = max_pdfs or self.config.MAX_PDF_PER_KEYWORD
         
-        # Check if browser is still responsive
-        if not self._is_browser_responsive():
+        # Check if browser, when one was started, is still responsive
+        if self.driver is not None and not self._is_browser_responsive():
             self._handle_browser_closure()
             return {
                 'keyword': keyword,
@@ -266,25 +715,33 @@ class PDFDownloader:
         # Create directories
         field_folder = os.path.join(self.download_path, field_name.replace(' ', '_'))
         keyword_folder = os.path.join(field_folder, keyword.replace(' ', '_'))
-        os.makedirs(keyword_folder, exist_ok=True)
+        if keyword_folder not in self._mkdir_cache:
+            os.makedirs(keyword_folder, exist_ok=True)
+            self._mkdir_cache.add(keyword_folder)
         
-        # Search for PDF URLs
-        pdf_urls = self._search_pdf_urls(keyword, max_pdfs)
+        # List the folder once; _save_pdf checks names against this set
+        existing = {entry.name for entry in os.scandir(keyword_folder)}
         
-        # Download PDFs
         downloaded_count = 0
         failed_count = 0
         
-        for pdf_url in pdf_urls:
-            if self._save_pdf(pdf_url, keyword_folder):
-                downloaded_count += 1
-            else:
-                failed_count += 1
+        # Downloads start as soon as a results page yields links, while the search moves on.
+        # Sized for the concurrency cap; AdaptiveConcurrency decides how many run at once
+        with ThreadPoolExecutor(max_workers=self.config.MAX_WORKERS or 16) as executor:
+            futures = {
+                executor.submit(self._save_pdf, pdf_url, keyword_folder, existing): pdf_url
+                for pdf_url in self._search_pdf_urls_iter(keyword, max_pdfs)
+            }
+            for future in as_completed(futures):
+                if future.result():
+                    downloaded_count += 1
+                else:
+                    failed_count += 1
         
         return {
             'keyword': keyword,
             'field': field_name,
-            'total_urls_found': len(pdf_urls),
+            'total_urls_found': len(futures),
             'downloaded_count': downloaded_count,
             'failed_count': failed_count,
             'save_path': keyword_folder
@@ -294,33 +751,68 @@ class PDFDownloader:
         """Download PDFs for all keywords in a field"""
         logger.info(f"📂 Starting downloads for field: {field_name}")
         
-        results = []
-        for keyword in keywords:
-            # Check if download should be stopped
+        workers = self.config.KEYWORD_WORKERS or 3
+        if workers <= 1:
+            results = []
+            for keyword in keywords:
+                # Check if download should be stopped
+                if self.should_stop:
+                    logger.info("🛑 Download stopped by user")
+                    break
+                results.append(self._process_keyword(keyword, field_name, max_pdfs_per_keyword))
+            return results
+        
+        # Keywords are independent searches, so run several at once; a worker that needs
+        # the browser starts its own
+        def run_keyword(keyword: str) -> Optional[Dict[str, any]]:
             if self.should_stop:
-                logger.info("🛑 Download stopped by user")
-                break
-                
-            try:
-                result = self.download_pdfs_for_keyword(keyword, field_name, max_pdfs_per_keyword)
-                results.append(result)
-                self._random_sleep(5, 10)  # Longer pause between keywords
-            except Exception as e:
-                logger.error(f"❗ Error processing keyword '{keyword}': {e}")
-                results.append({
-                    'keyword': keyword,
-                    'field': field_name,
-                    'error': str(e)
-                })
+                return None
+            self._local.is_worker = True
+            return self._process_keyword(keyword, field_name, max_pdfs_per_keyword)
         
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run_keyword, keyword) for keyword in keywords]
+                results = []
+                for keyword, future in zip(keywords, futures):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"❗ Error processing keyword '{keyword}': {e}")
+                        result = {'keyword': keyword, 'field': field_name, 'error': str(e)}
+                    if result is not None:
+                        results.append(result)
+        finally:
+            # Close the browsers the workers started; the threads that owned them are gone
+            with self._drivers_lock:
+                worker_drivers = [driver for driver in self._drivers if driver is not self.driver]
+            for driver in worker_drivers:
+                self._quit_driver(driver)
+        
+        if self.should_stop:
+            logger.info("🛑 Download stopped by user")
         return results
     
+    def _process_keyword(self, keyword: str, field_name: str, max_pdfs: int = None) -> Dict[str, any]:
+        """Download one keyword of a field, reporting errors in the result"""
+        try:
+            result = self.download_pdfs_for_keyword(keyword, field_name, max_pdfs)
+            self._random_sleep(5, 10)  # Longer pause between keywords
+            return result
+        except Exception as e:
+            logger.error(f"❗ Error processing keyword '{keyword}': {e}")
+            return {
+                'keyword': keyword,
+                'field': field_name,
+                'error': str(e)
+            }
+    
     def download_all_pdfs(self, fields_keywords: Dict[str, List[str]] = None) -> Dict[str, List[Dict[str, any]]]:
         """Download PDFs for all fields and keywords"""
         fields_keywords = fields_keywords or self.config.get_fields_keywords()
         
         try:
-            self.driver = self._setup_driver()
+            # The browser is started lazily, only when a results page needs it
             logger.info("🚀 Starting PDF download process")
             
             all_results = {}
@@ -332,7 +824,7 @@ class PDFDownloader:
                     break
                 
                 # Check if browser is still responsive
-                if not self._is_browser_responsive():
+                if self.driver and not self._is_browser_responsive():
                     self._handle_browser_closure()
                     break
                     
@@ -350,18 +842,17 @@ class PDFDownloader:
             logger.error(f"❗ Fatal error: {e}")
             raise
         finally:
-            if self.driver:
-                try:
-                    self.driver.quit()
-                    logger.info("🔒 Browser closed")
-                except Exception as e:
-                    logger.warning(f"⚠️ Error closing browser: {e}")
+            if self.driver and self._quit_driver(self.driver):
+                logger.info("🔒 Browser closed")
+            self.driver = None
+            self.close()
     
     def download_single_keyword(self, keyword: str, field_name: str = "custom", max_pdfs: int = None) -> Dict[str, any]:
         """Download PDFs for a single keyword"""
         try:
-            self.driver = self._setup_driver()
             return self.download_pdfs_for_keyword(keyword, field_name, max_pdfs)
         finally:
             if self.driver:
-                self.driver.quit() 
\ No newline at end of file
+                self._quit_driver(self.driver)
+            self.driver = None
+            self.close() 
\ No newline at end of file
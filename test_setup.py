@@ -5,33 +5,32 @@ Test script to verify PDF Downloader setup
 
 import sys
 import os
-import importlib
+import importlib.util
 
 def test_imports():
-    """Test if all required modules can be imported"""
+    """Test if all required modules can be found (without importing them)"""
     print("🔍 Testing imports...")
     
-    required_modules = [
-        'flask',
-        'selenium',
-        'requests',
-        'fake_useragent',
-        'webdriver_manager',
-        'python-dotenv'
-    ]
+    # Package name -> module name; find_spec only locates the module, it doesn't run it
+    required_modules = {
+        'flask': 'flask',
+        'selenium': 'selenium',
+        'requests': 'requests',
+        'fake_useragent': 'fake_useragent',
+        'webdriver_manager': 'webdriver_manager',
+        'python-dotenv': 'dotenv',
+        'lxml': 'lxml',
+        'orjson': 'orjson'
+    }
     
     failed_imports = []
     
-    for module in required_modules:
-        try:
-            if module == 'python-dotenv':
-                importlib.import_module('dotenv')
-            else:
-                importlib.import_module(module)
-            print(f"✅ {module}")
-        except ImportError as e:
-            print(f"❌ {module}: {e}")
-            failed_imports.append(module)
+    for package, module in required_modules.items():
+        if importlib.util.find_spec(module) is not None:
+            print(f"✅ {package}")
+        else:
+            print(f"❌ {package}: module '{module}' not found")
+            failed_imports.append(package)
     
     if failed_imports:
         print(f"\n⚠️ Failed imports: {failed_imports}")